@@ -1,12 +1,25 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict
+
+import numpy as np
 
 
 @dataclass
 class ModelMeta:
     kind: str  # 'isotonic' or 'pchip' or 'piecewise'
     context: str  # 'rest' or 'active' or 'global'
-    x_knots: List[float]
-    y_knots: List[float]
+    x_knots: np.ndarray  # float32; kept as arrays so prediction never reconverts
+    y_knots: np.ndarray
     clip_lo: float
     clip_hi: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable representation; knot arrays become plain lists."""
+        return {
+            'kind': self.kind,
+            'context': self.context,
+            'x_knots': np.asarray(self.x_knots, dtype=float).tolist(),
+            'y_knots': np.asarray(self.y_knots, dtype=float).tolist(),
+            'clip_lo': self.clip_lo,
+            'clip_hi': self.clip_hi,
+        }
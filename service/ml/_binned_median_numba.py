@@ -0,0 +1,51 @@
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def fit_binned_medians(x: np.ndarray, y: np.ndarray, indices: np.ndarray,
+                       num_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute per-bin medians of x and y given precomputed bin indices.
+
+    Two-pass bucket sort: count bin occupancy, scatter values into contiguous
+    buckets, then take the median of each non-empty bucket. Out-of-range
+    indices (below the first or at/above the last bin edge) are skipped,
+    matching np.digitize semantics in the caller.
+    """
+    n = x.shape[0]
+
+    counts = np.zeros(num_bins, dtype=np.int64)
+    for i in range(n):
+        idx = indices[i]
+        if 0 <= idx < num_bins:
+            counts[idx] += 1
+
+    offsets = np.zeros(num_bins + 1, dtype=np.int64)
+    for b in range(num_bins):
+        offsets[b + 1] = offsets[b] + counts[b]
+
+    total = offsets[num_bins]
+    x_buckets = np.empty(total, dtype=np.float64)
+    y_buckets = np.empty(total, dtype=np.float64)
+    cursor = offsets[:num_bins].copy()
+    for i in range(n):
+        idx = indices[i]
+        if 0 <= idx < num_bins:
+            pos = cursor[idx]
+            x_buckets[pos] = x[i]
+            y_buckets[pos] = y[i]
+            cursor[idx] += 1
+
+    x_medians = np.empty(num_bins, dtype=np.float64)
+    y_medians = np.empty(num_bins, dtype=np.float64)
+    filled = 0
+    for b in range(num_bins):
+        start, end = offsets[b], offsets[b + 1]
+        if end > start:
+            x_medians[filled] = np.median(x_buckets[start:end])
+            y_medians[filled] = np.median(y_buckets[start:end])
+            filled += 1
+
+    return x_medians[:filled].copy(), y_medians[:filled].copy()
@@ -0,0 +1,38 @@
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def pava(y: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """Weighted pool-adjacent-violators in a single linear pass.
+
+    Maintains a stack of (mean, weight, count) blocks over y, merging the
+    top blocks while they violate monotonicity, then expands the block
+    means back to per-element fitted values. O(n) versus the quadratic
+    worst case of naive implementations.
+    """
+    n = y.shape[0]
+    means = np.empty(n, dtype=np.float64)
+    weights = np.empty(n, dtype=np.float64)
+    counts = np.empty(n, dtype=np.int64)
+
+    top = -1
+    for i in range(n):
+        top += 1
+        means[top] = y[i]
+        weights[top] = w[i]
+        counts[top] = 1
+        while top > 0 and means[top - 1] > means[top]:
+            merged_weight = weights[top - 1] + weights[top]
+            means[top - 1] = (weights[top - 1] * means[top - 1] + weights[top] * means[top]) / merged_weight
+            weights[top - 1] = merged_weight
+            counts[top - 1] += counts[top]
+            top -= 1
+
+    fitted = np.empty(n, dtype=np.float64)
+    pos = 0
+    for block in range(top + 1):
+        for _ in range(counts[block]):
+            fitted[pos] = means[block]
+            pos += 1
+    return fitted
@@ -0,0 +1,62 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _eval_clipped(v: float, x_knots: np.ndarray, coeffs: np.ndarray,
+                  clip_lo: float, clip_hi: float) -> float:
+    """Clamp v to the knot range, evaluate the cubic, clip the result."""
+    if v < x_knots[0]:
+        v = x_knots[0]
+    elif v > x_knots[-1]:
+        v = x_knots[-1]
+
+    lo = 0
+    hi = x_knots.shape[0] - 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if v < x_knots[mid]:
+            hi = mid
+        else:
+            lo = mid
+
+    t = v - x_knots[lo]
+    y = ((coeffs[0, lo] * t + coeffs[1, lo]) * t + coeffs[2, lo]) * t + coeffs[3, lo]
+    return min(clip_hi, max(clip_lo, y))
+
+
+@njit(parallel=True, cache=True)
+def pchip_dispatch_eval(x: np.ndarray, use_first: np.ndarray,
+                        x_knots_1: np.ndarray, coeffs_1: np.ndarray, clip_lo_1: float, clip_hi_1: float,
+                        x_knots_2: np.ndarray, coeffs_2: np.ndarray, clip_lo_2: float, clip_hi_2: float,
+                        out: np.ndarray) -> None:
+    """Per-row dispatch between two piecewise cubics in one parallel pass."""
+    for i in prange(x.shape[0]):
+        if use_first[i]:
+            out[i] = _eval_clipped(x[i], x_knots_1, coeffs_1, clip_lo_1, clip_hi_1)
+        else:
+            out[i] = _eval_clipped(x[i], x_knots_2, coeffs_2, clip_lo_2, clip_hi_2)
+
+
+@njit(parallel=True, cache=True)
+def pchip_eval(x: np.ndarray, x_knots: np.ndarray, coeffs: np.ndarray, out: np.ndarray) -> None:
+    """Evaluate a piecewise cubic over x in parallel.
+
+    coeffs is the (4, n_intervals) local-power-basis coefficient matrix as
+    produced by scipy's PPoly (highest degree first); each element binary
+    searches its interval and applies Horner's rule. Inputs are expected to
+    be pre-clipped to [x_knots[0], x_knots[-1]].
+    """
+    n_intervals = x_knots.shape[0] - 1
+    for i in prange(x.shape[0]):
+        v = x[i]
+        lo = 0
+        hi = n_intervals
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if v < x_knots[mid]:
+                hi = mid
+            else:
+                lo = mid
+        t = v - x_knots[lo]
+        out[i] = ((coeffs[0, lo] * t + coeffs[1, lo]) * t + coeffs[2, lo]) * t + coeffs[3, lo]
@@ -1,21 +1,25 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 
+from service.ml._binned_median_numba import fit_binned_medians
+
 
 class BinnedMedianFitter:
     """Handles binned median fitting operations."""
 
     @staticmethod
-    def fit(x: np.ndarray, y: np.ndarray, bins: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        """Bin x values and compute median y values; drop empty bins."""
-        indices = np.digitize(x, bins) - 1
-        x_medians, y_medians = [], []
-
-        for bin_idx in range(len(bins) - 1):
-            mask = indices == bin_idx
-            if np.any(mask):
-                x_medians.append(np.median(x[mask]))
-                y_medians.append(np.median(y[mask]))
-
-        return np.array(x_medians), np.array(y_medians)
+    def fit(x: np.ndarray, y: np.ndarray, bins: np.ndarray,
+            indices: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Bin x values and compute median y values; drop empty bins.
+
+        Callers that already hold digitize-style bin indices for x can pass
+        them via `indices` to skip the recomputation.
+        """
+        if indices is None:
+            indices = np.digitize(x, bins) - 1
+
+        x_array = np.ascontiguousarray(x, dtype=np.float64)
+        y_array = np.ascontiguousarray(y, dtype=np.float64)
+
+        return fit_binned_medians(x_array, y_array, indices, len(bins) - 1)
@@ -1,4 +1,4 @@
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Optional, Dict, Any
 
 import numpy as np
@@ -39,15 +39,26 @@ class ContextualModelTrainer:
         # Split by context
         rest_data, active_data = self._split_by_context(pairs)
 
-        # Train context-specific models
+        # Train context-specific models; the two contexts share no state, and
+        # the fitting work runs in GIL-releasing native code, so both train
+        # concurrently into separate result dicts merged afterwards
         results = {}
         context_models = {}
+        rest_results, active_results = {}, {}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rest_future = executor.submit(self._train_context_model, rest_data, 'rest', rest_results)
+            active_future = executor.submit(self._train_context_model, active_data, 'active', active_results)
+
+            rest_model = rest_future.result()
+            active_model = active_future.result()
+
+        results.update(rest_results)
+        results.update(active_results)
 
-        rest_model = self._train_context_model(rest_data, 'rest', results)
         if rest_model:
             context_models['rest'] = rest_model
 
-        active_model = self._train_context_model(active_data, 'active', results)
         if active_model:
             context_models['active'] = active_model
 
@@ -61,9 +72,13 @@ class ContextualModelTrainer:
 
     def _split_by_context(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Split data into rest and active contexts."""
-        rest_data = df[df['sleep_status'].fillna(0) > 0].copy()
-        active_data = df[df['is_sport'] | (df['sleep_status'].fillna(0) == 0)].copy()
-        return rest_data, active_data
+        # Materialize sleep_status once (missing -> 0) and derive both masks
+        # from it; views are enough since downstream only reads numpy arrays
+        sleep_status = df['sleep_status'].to_numpy(dtype='float64', na_value=0.0)
+        rest_mask = sleep_status > 0
+        active_mask = df['is_sport'].to_numpy(dtype=bool) | ~rest_mask
+
+        return df[rest_mask], df[active_mask]
 
     def _train_context_model(self, context_data: pd.DataFrame, context_name: str,
                              results: Dict[str, Any]) -> Optional[ModelMeta]:
@@ -71,8 +86,8 @@ class ContextualModelTrainer:
         if len(context_data) < self.MIN_SAMPLES_PER_CONTEXT:
             return None
 
-        x_values = context_data['scan_bpm'].to_numpy()
-        y_values = context_data['t10_bpm'].to_numpy()
+        x_values = context_data['scan_bpm'].to_numpy(dtype=np.float32)
+        y_values = context_data['t10_bpm'].to_numpy(dtype=np.float32)
 
         # Fit model based on specified kind
         if self.model_kind == ModelKind.PCHIP.value:
@@ -82,14 +97,15 @@ class ContextualModelTrainer:
         else:
             raise ValueError(f"Unknown model kind: {self.model_kind}")
 
-        # Generate predictions and calculate metrics
+        # Generate predictions and calculate metrics (assign allocates only
+        # the new column block, leaving the original frame untouched)
         y_predicted = self.predictor.apply_model(model_meta, x_values)
-        context_data['y_hat'] = y_predicted
+        context_data = context_data.assign(y_hat=y_predicted)
 
         # Store results
         results[f'{context_name}_metrics'] = self.metrics_calc.calculate_metrics(context_data).to_dict(orient='records')
         results[f'{context_name}_n'] = int(len(context_data))
-        results[f'{context_name}_model'] = asdict(model_meta)
+        results[f'{context_name}_model'] = model_meta.to_dict()
 
         return model_meta
 
@@ -101,23 +117,23 @@ class ContextualModelTrainer:
             # Fallback to global model
             return self._apply_global_fallback(pairs, results)
 
-        def predict_for_row(row):
-            """Predict heart rate for a single row based on context."""
-            scan_bpm = row['scan_bpm']
-
-            # Choose model based on context
-            if ('rest' in context_models and
-                    row['sleep_status'] and int(row['sleep_status']) > 0):
-                return float(self.predictor.apply_model(context_models['rest'], np.array([scan_bpm]))[0])
-            elif 'active' in context_models:
-                return float(self.predictor.apply_model(context_models['active'], np.array([scan_bpm]))[0])
-            elif 'rest' in context_models:
-                # Fallback to rest model if active not available
-                return float(self.predictor.apply_model(context_models['rest'], np.array([scan_bpm]))[0])
-            else:
-                raise ValueError("No suitable model available for prediction")
-
-        pairs['y_hat'] = pairs.apply(predict_for_row, axis=1)
+        scan_bpm = pairs['scan_bpm'].to_numpy(dtype=np.float32)
+        sleep_status = pairs['sleep_status'].fillna(0).to_numpy()
+
+        # Rest model handles sleeping rows; everything else goes to the
+        # active model, falling back to rest when active is unavailable
+        rest_mask = (sleep_status > 0) if 'rest' in context_models else np.zeros(len(pairs), dtype=bool)
+        remainder_model = context_models.get('active', context_models.get('rest'))
+
+        if 'rest' in context_models:
+            # Fused per-row dispatch (JIT-parallel on large PCHIP batches)
+            y_hat = self.predictor.apply_contextual(
+                context_models['rest'], remainder_model, scan_bpm, rest_mask
+            )
+        else:
+            y_hat = self.predictor.apply_model(remainder_model, scan_bpm)
+
+        pairs['y_hat'] = y_hat.astype(np.float32, copy=False)
         pairs['calibrated_bpm'] = pairs['y_hat']
 
         # Calculate overall metrics
@@ -129,16 +145,16 @@ class ContextualModelTrainer:
     def _apply_global_fallback(self, pairs: pd.DataFrame,
                                results: Dict[str, Any]) -> pd.DataFrame:
         """Apply a single global model as fallback."""
-        x_values = pairs['scan_bpm'].to_numpy()
-        y_values = pairs['t10_bpm'].to_numpy()
+        x_values = pairs['scan_bpm'].to_numpy(dtype=np.float32)
+        y_values = pairs['t10_bpm'].to_numpy(dtype=np.float32)
 
         global_model = self.model_fitter.fit_pchip_from_binned(x_values, y_values, context='global')
-        pairs['y_hat'] = self.predictor.apply_model(global_model, x_values)
+        pairs['y_hat'] = self.predictor.apply_model(global_model, x_values).astype(np.float32, copy=False)
         pairs['calibrated_bpm'] = pairs['y_hat']
 
         results['global_metrics'] = self.metrics_calc.calculate_metrics(pairs).to_dict(orient='records')
         results['global_n'] = int(len(pairs))
-        results['global_model'] = asdict(global_model)
+        results['global_model'] = global_model.to_dict()
 
         return pairs
 
@@ -147,7 +163,7 @@ class ContextualModelTrainer:
         """Prepare the final export data structure."""
         chosen_models = {}
         for context, model in context_models.items():
-            chosen_models[context] = asdict(model)
+            chosen_models[context] = model.to_dict()
 
         return {
             'chosen_models': chosen_models,
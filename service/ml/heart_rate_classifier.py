@@ -1,8 +1,13 @@
+import numpy as np
+
 from dto.enums.hr_zones import HeartRateZone
 
 class HeartRateZoneClassifier:
     """Classifies heart rate values into zones."""
 
+    ZONE_BINS = np.array([60, 90, 120])
+    ZONE_LABELS = np.array([zone.value for zone in HeartRateZone])
+
     @staticmethod
     def classify(heart_rate: float) -> str:
         """Classify heart rate into predefined zones."""
@@ -13,4 +18,14 @@ class HeartRateZoneClassifier:
         elif heart_rate < 120:
             return HeartRateZone.MODERATE.value
         else:
-            return HeartRateZone.HIGH.value
\ No newline at end of file
+            return HeartRateZone.HIGH.value
+
+    @classmethod
+    def classify_indices(cls, heart_rates: np.ndarray) -> np.ndarray:
+        """Map an array of heart rates to zone indices (positions in ZONE_LABELS)."""
+        return np.digitize(heart_rates, cls.ZONE_BINS)
+
+    @classmethod
+    def classify_array(cls, heart_rates: np.ndarray) -> np.ndarray:
+        """Classify an array of heart rates into zones in a single vectorized pass."""
+        return cls.ZONE_LABELS[cls.classify_indices(heart_rates)]
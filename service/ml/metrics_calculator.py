@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from service.ml.heart_rate_classifier import HeartRateZoneClassifier
@@ -9,15 +10,24 @@ class MetricsCalculator:
     @staticmethod
     def calculate_metrics(df: pd.DataFrame, pred_col: str = 'y_hat') -> pd.DataFrame:
         """Calculate MAE, bias, and other metrics grouped by heart rate zones."""
-        df_copy = df.copy()
-        df_copy['abs_err'] = (df_copy['t10_bpm'] - df_copy[pred_col]).abs()
-        df_copy['bias'] = df_copy['t10_bpm'] - df_copy[pred_col]
-        df_copy['zone'] = df_copy['scan_bpm'].apply(HeartRateZoneClassifier.classify)
+        t10 = df['t10_bpm'].to_numpy()
+        pred = df[pred_col].to_numpy()
 
-        metrics = df_copy.groupby('zone').agg(
+        bias = t10 - pred
+        abs_err = np.abs(bias)
+        if 'scan_zone_idx' in df.columns:
+            # Reuse the zone indices precomputed at pair-building time
+            zone = HeartRateZoneClassifier.ZONE_LABELS[df['scan_zone_idx'].to_numpy()]
+        else:
+            zone = HeartRateZoneClassifier.classify_array(df['scan_bpm'].to_numpy())
+
+        # Group on a minimal temp frame instead of copying the full input
+        grouped = pd.DataFrame({'zone': zone, 'abs_err': abs_err, 'bias': bias})
+
+        metrics = grouped.groupby('zone').agg(
             n=('abs_err', 'size'),
             MAE=('abs_err', 'mean'),
             bias=('bias', 'mean')
         ).reset_index()
 
-        return metrics
\ No newline at end of file
+        return metrics
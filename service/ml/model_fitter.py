@@ -6,6 +6,7 @@ from sklearn.isotonic import IsotonicRegression
 from dto.enums.model_kind import ModelKind
 from dto.model_meta import ModelMeta
 from service.ml.binned_median_fitter import BinnedMedianFitter
+from service.ml._pava_numba import pava
 
 
 class ModelFitter:
@@ -15,6 +16,9 @@ class ModelFitter:
     DEFAULT_NUM_BINS = 15
     MIN_POINTS_FOR_PCHIP = 3
 
+    # Escape hatch to the sklearn solver, should the linear PAVA ever misbehave
+    USE_SKLEARN_ISOTONIC = False
+
     @classmethod
     def fit_isotonic(cls, x: np.ndarray, y: np.ndarray,
                      context: str = 'global',
@@ -24,18 +28,23 @@ class ModelFitter:
         sort_order = np.argsort(x)
         x_sorted, y_sorted = x[sort_order], y[sort_order]
 
-        isotonic_reg = IsotonicRegression(increasing=True, out_of_bounds='clip')
-        y_fitted = isotonic_reg.fit_transform(x_sorted, y_sorted)
-
-        # Extract unique x values and corresponding fitted y values as knots
-        x_knots, unique_indices = np.unique(x_sorted, return_index=True)
-        y_knots = y_fitted[unique_indices]
+        if cls.USE_SKLEARN_ISOTONIC:
+            isotonic_reg = IsotonicRegression(increasing=True, out_of_bounds='clip')
+            y_fitted = isotonic_reg.fit_transform(x_sorted, y_sorted)
+            x_knots, unique_indices = np.unique(x_sorted, return_index=True)
+            y_knots = y_fitted[unique_indices]
+        else:
+            # Collapse duplicate x to weighted means (sklearn's tie handling),
+            # then run the linear-time pool-adjacent-violators kernel
+            x_knots, inverse, knot_counts = np.unique(x_sorted, return_inverse=True, return_counts=True)
+            y_means = np.bincount(inverse, weights=y_sorted.astype(np.float64)) / knot_counts
+            y_knots = pava(y_means, knot_counts.astype(np.float64))
 
         return ModelMeta(
             kind=ModelKind.ISOTONIC.value,
             context=context,
-            x_knots=x_knots.tolist(),
-            y_knots=y_knots.tolist(),
+            x_knots=np.asarray(x_knots, dtype=np.float32),
+            y_knots=np.asarray(y_knots, dtype=np.float32),
             clip_lo=float(clip_range[0]),
             clip_hi=float(clip_range[1])
         )
@@ -62,8 +71,8 @@ class ModelFitter:
         return ModelMeta(
             kind=ModelKind.PCHIP.value,
             context=context,
-            x_knots=binned_x.tolist(),
-            y_knots=binned_y.tolist(),
+            x_knots=binned_x.astype(np.float32),
+            y_knots=binned_y.astype(np.float32),
             clip_lo=float(clip_range[0]),
             clip_hi=float(clip_range[1])
         )
@@ -1,27 +1,99 @@
+import functools
+from typing import Tuple
+
 import numpy as np
 from scipy.interpolate import PchipInterpolator
 
 from dto.enums.model_kind import ModelKind
 from dto.model_meta import ModelMeta
+from service.ml._pchip_numba import pchip_dispatch_eval, pchip_eval
+
+
+@functools.lru_cache(maxsize=16)
+def _build_pchip(x_knots: Tuple[float, ...], y_knots: Tuple[float, ...]) -> PchipInterpolator:
+    """Build (and memoize) the piecewise polynomial for a set of knots."""
+    return PchipInterpolator(np.array(x_knots), np.array(y_knots), extrapolate=True)
+
+
+@functools.lru_cache(maxsize=16)
+def _build_pchip_coeffs(x_knots: Tuple[float, ...], y_knots: Tuple[float, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract contiguous breakpoints and coefficients for the Numba evaluator."""
+    interpolator = _build_pchip(x_knots, y_knots)
+    return np.ascontiguousarray(interpolator.x), np.ascontiguousarray(interpolator.c)
+
+
+def _scalar_eval(meta: ModelMeta, x: float) -> float:
+    """Evaluate a model on a single value without array allocations."""
+    x_clamped = max(meta.x_knots[0], min(meta.x_knots[-1], x))
+
+    if meta.kind == ModelKind.ISOTONIC.value:
+        return float(np.interp(x_clamped, meta.x_knots, meta.y_knots))
+    elif meta.kind == ModelKind.PCHIP.value:
+        y = float(_build_pchip(tuple(meta.x_knots), tuple(meta.y_knots))(x_clamped))
+        return max(meta.clip_lo, min(meta.clip_hi, y))
+    else:
+        raise ValueError(f"Unknown model kind: {meta.kind}")
 
 
 class ModelPredictor:
     """Handles model application and prediction."""
 
+    # Below this size the scipy call wins; above it the prange kernel scales
+    # across cores while scipy stays single-threaded
+    PARALLEL_MIN_SIZE = 1024
+
     @staticmethod
     def apply_model(meta: ModelMeta, x: np.ndarray) -> np.ndarray:
         """Apply a trained model to input data."""
-        x_array = np.asarray(x, dtype=float)
-        x_clipped = np.clip(x_array, meta.x_knots[0], meta.x_knots[-1])
+        # Fast path for scalar input: no intermediate arrays
+        if np.isscalar(x) or (hasattr(x, 'shape') and x.shape == ()):
+            return _scalar_eval(meta, float(x))
 
-        x_knots_array = np.array(meta.x_knots)
-        y_knots_array = np.array(meta.y_knots)
+        # Single contiguous scratch copy, then clip in place — the caller's
+        # array is never mutated and no further temporaries are allocated
+        x_clipped = np.array(x, dtype=np.float64)
+        np.clip(x_clipped, meta.x_knots[0], meta.x_knots[-1], out=x_clipped)
 
         if meta.kind == ModelKind.ISOTONIC.value:
-            return np.interp(x_clipped, x_knots_array, y_knots_array)
+            return np.interp(x_clipped, meta.x_knots, meta.y_knots)
         elif meta.kind == ModelKind.PCHIP.value:
-            interpolator = PchipInterpolator(x_knots_array, y_knots_array, extrapolate=True)
-            y_predicted = interpolator(x_clipped)
-            return np.clip(y_predicted, meta.clip_lo, meta.clip_hi)
+            if x_clipped.size >= ModelPredictor.PARALLEL_MIN_SIZE:
+                knots, coeffs = _build_pchip_coeffs(tuple(meta.x_knots), tuple(meta.y_knots))
+                y_predicted = np.empty_like(x_clipped)
+                pchip_eval(x_clipped, knots, coeffs, y_predicted)
+            else:
+                interpolator = _build_pchip(tuple(meta.x_knots), tuple(meta.y_knots))
+                y_predicted = interpolator(x_clipped)
+            np.clip(y_predicted, meta.clip_lo, meta.clip_hi, out=y_predicted)
+            return y_predicted
         else:
             raise ValueError(f"Unknown model kind: {meta.kind}")
+
+    @staticmethod
+    def apply_contextual(first_meta: ModelMeta, second_meta: ModelMeta,
+                         x: np.ndarray, use_first: np.ndarray) -> np.ndarray:
+        """Apply one of two models per element, selected by a boolean mask.
+
+        Large PCHIP batches run through a fused parallel kernel that picks
+        the model inside the loop; other cases fall back to one masked
+        apply_model call per model.
+        """
+        if (first_meta.kind == ModelKind.PCHIP.value
+                and second_meta.kind == ModelKind.PCHIP.value
+                and x.size >= ModelPredictor.PARALLEL_MIN_SIZE):
+            first_knots, first_coeffs = _build_pchip_coeffs(tuple(first_meta.x_knots), tuple(first_meta.y_knots))
+            second_knots, second_coeffs = _build_pchip_coeffs(tuple(second_meta.x_knots), tuple(second_meta.y_knots))
+
+            y_predicted = np.empty(x.size, dtype=np.float64)
+            pchip_dispatch_eval(np.ascontiguousarray(x, dtype=np.float64), use_first,
+                                first_knots, first_coeffs, first_meta.clip_lo, first_meta.clip_hi,
+                                second_knots, second_coeffs, second_meta.clip_lo, second_meta.clip_hi,
+                                y_predicted)
+            return y_predicted
+
+        y_predicted = np.empty(x.size, dtype=np.float64)
+        if use_first.any():
+            y_predicted[use_first] = ModelPredictor.apply_model(first_meta, x[use_first])
+        if (~use_first).any():
+            y_predicted[~use_first] = ModelPredictor.apply_model(second_meta, x[~use_first])
+        return y_predicted
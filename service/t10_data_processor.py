@@ -1,4 +1,6 @@
 import sqlite3
+
+import numpy as np
 import pandas as pd
 
 from dto.query_columns import QueryColumns
@@ -11,6 +13,8 @@ from contextlib import contextmanager
 class T10DataProcessor:
     """Handles T10 data extraction and processing from SQLite database"""
 
+    HR_QUERY_CHUNKSIZE = 200_000
+
     def __init__(self, sqlite_path: str, timezone: str, user_id: Optional[int] = None):
         self.sqlite_path = sqlite_path
         self.timezone = timezone
@@ -27,7 +31,9 @@ class T10DataProcessor:
 
     def process_heart_rate_data(self, conn: sqlite3.Connection, hr_table: str, bin_size: str) -> pd.DataFrame:
         """Process heart rate data and return aggregated T10 data"""
-        df_hr = pandas_query_table(conn, hr_table, QueryColumns.HR_COLUMNS, self.user_id)
+        # The HR table is by far the largest; stream it in chunks
+        df_hr = pandas_query_table(conn, hr_table, QueryColumns.HR_COLUMNS, self.user_id,
+                                   chunksize=self.HR_QUERY_CHUNKSIZE)
 
         if df_hr.empty:
             return pd.DataFrame(columns=['window_utc', 't10_bpm', 't10_points'])
@@ -35,12 +41,24 @@ class T10DataProcessor:
         df_hr['timestamp_utc'] = to_utc_from_local_string(df_hr['time'], self.timezone)
         df_hr['window_utc'] = floor_to_bin(df_hr['timestamp_utc'], bin_size)
 
-        t10_min = df_hr.groupby('window_utc').agg(
-            t10_bpm=('heartRate', 'mean'),
-            t10_points=('heartRate', 'size')
-        ).reset_index().sort_values('window_utc')
+        # Bin-floored timestamps group into monotonic int64 keys, so a sorted
+        # reduceat mean avoids pandas' hash-based groupby entirely
+        window_ns = df_hr['window_utc'].to_numpy(dtype='datetime64[ns]').view('int64')
+        heart_rate = df_hr['heartRate'].to_numpy(dtype=np.float64)
+
+        if not np.all(np.diff(window_ns) >= 0):
+            order = np.argsort(window_ns, kind='stable')
+            window_ns, heart_rate = window_ns[order], heart_rate[order]
+
+        keys, starts = np.unique(window_ns, return_index=True)
+        sums = np.add.reduceat(heart_rate, starts)
+        counts = np.diff(np.append(starts, len(heart_rate)))
 
-        return t10_min
+        return pd.DataFrame({
+            'window_utc': pd.to_datetime(keys, unit='ns', utc=True),
+            't10_bpm': sums / counts,
+            't10_points': counts,
+        })
 
     def process_sleep_data(self, conn: sqlite3.Connection, sleep_table: str) -> pd.DataFrame:
         """Process sleep data and return formatted DataFrame"""
@@ -0,0 +1,36 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True, boundscheck=False)
+def sleep_status_kernel(window_starts_ns: np.ndarray, window_ends_ns: np.ndarray,
+                        sleep_starts_ns: np.ndarray, sleep_ends_ns: np.ndarray,
+                        statuses: np.ndarray, max_end_prefix_ns: np.ndarray) -> np.ndarray:
+    """Pick the sleep status with maximum overlap for each window.
+
+    Sleep intervals must be sorted by start, with max_end_prefix_ns the
+    running maximum of their ends. Each window binary-searches the last
+    interval starting before its end and walks backwards only while the
+    prefix maximum proves an overlap is still possible, so the inner scan
+    touches just the handful of candidate intervals instead of all of them.
+    All timestamps are int64 nanoseconds; ties keep the earliest interval,
+    matching the previous behavior.
+    """
+    n_windows = window_starts_ns.shape[0]
+    out = np.zeros(n_windows, dtype=np.int64)
+
+    for i in prange(n_windows):
+        best_status = 0
+        max_overlap = 0
+        j = np.searchsorted(sleep_starts_ns, window_ends_ns[i]) - 1
+        while j >= 0 and max_end_prefix_ns[j] > window_starts_ns[i]:
+            overlap = (min(window_ends_ns[i], sleep_ends_ns[j])
+                       - max(window_starts_ns[i], sleep_starts_ns[j]))
+            # Walking backwards, so an equal overlap from an earlier interval wins
+            if overlap > 0 and overlap >= max_overlap:
+                max_overlap = overlap
+                best_status = statuses[j]
+            j -= 1
+        out[i] = best_status
+
+    return out
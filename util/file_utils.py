@@ -1,12 +1,15 @@
 import ast
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 
+import numpy as np
+import orjson
 import pandas as pd
 from pandas import DataFrame
 
 from service.t10_data_processor import T10DataProcessor
-from util.time_utlis import parse_iso_to_utc, to_utc_from_local_string, floor_to_bin
+from util.time_utlis import to_utc_from_local_string, floor_to_bin
 
 
 def get_scanwatch_data(path: str) -> DataFrame:
@@ -27,11 +30,17 @@ def get_scanwatch_data(path: str) -> DataFrame:
         s = str(cell).strip()
         if s == "" or s == "[]":
             return []
-        return ast.literal_eval(s)
-
-    df['durations'] = df['duration'].apply(parse_list_cell)
-    df['values'] = df['value'].apply(parse_list_cell)
-    df['start_utc'] = df['start'].apply(parse_iso_to_utc)
+        try:
+            # Numeric list reprs are JSON-compatible; orjson parses them at C speed
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return ast.literal_eval(s)
+
+    parse_cells = np.frompyfunc(parse_list_cell, 1, 1)
+    df['durations'] = parse_cells(df['duration'].to_numpy())
+    df['values'] = parse_cells(df['value'].to_numpy())
+    # One C-level parse pass over the whole column, with repeated strings cached
+    df['start_utc'] = pd.to_datetime(df['start'], utc=True, format='ISO8601', cache=True)
     return df[['start_utc', 'durations', 'values']]
 
 
@@ -65,11 +74,21 @@ def get_t10_data(
     """
     processor = T10DataProcessor(sqlite_path, timezone, user_id)
 
-    try:
+    def run_with_connection(process, *args):
+        # Each worker gets its own connection: sqlite allows concurrent
+        # readers, and the C-level query/conversion work releases the GIL
         with processor.get_db_connection() as conn:
-            t10_min = processor.process_heart_rate_data(conn, hr_table, bin_size)
-            df_sleep = processor.process_sleep_data(conn, sleep_table)
-            df_sport = processor.process_sport_data(conn, sport_table)
+            return process(conn, *args)
+
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            hr_future = executor.submit(run_with_connection, processor.process_heart_rate_data, hr_table, bin_size)
+            sleep_future = executor.submit(run_with_connection, processor.process_sleep_data, sleep_table)
+            sport_future = executor.submit(run_with_connection, processor.process_sport_data, sport_table)
+
+            t10_min = hr_future.result()
+            df_sleep = sleep_future.result()
+            df_sport = sport_future.result()
 
         return t10_min, df_sleep, df_sport
 
@@ -1,10 +1,12 @@
+import sqlite3
 from typing import Optional
 
 import pandas as pd
 from pandas import DataFrame
 
 
-def pandas_query_table(conn, table: str, columns: list, user_id: Optional[int] = None) -> DataFrame:
+def pandas_query_table(conn, table: str, columns: list, user_id: Optional[int] = None,
+                       chunksize: Optional[int] = None) -> DataFrame:
     """Query a database table and return the results as a pandas DataFrame.
 
     Args:
@@ -12,6 +14,8 @@ def pandas_query_table(conn, table: str, columns: list, user_id: Optional[int] =
         table: Name of the table to query
         columns: List of column names to select
         user_id: Optional user ID to filter results by
+        chunksize: Optional number of rows to stream per chunk instead of
+            materializing the full result set in one pass (useful for large tables)
 
     Returns:
         DataFrame containing the query results
@@ -19,6 +23,20 @@ def pandas_query_table(conn, table: str, columns: list, user_id: Optional[int] =
     q = f"SELECT {', '.join(columns)} FROM {table}"
     params = []
     if user_id is not None:
+        _ensure_user_id_index(conn, table)
         q += " WHERE userId = ?"
         params.append(user_id)
+
+    if chunksize is not None:
+        chunks = pd.read_sql_query(q, conn, params=params, chunksize=chunksize)
+        return pd.concat(chunks, ignore_index=True)
     return pd.read_sql_query(q, conn, params=params)
+
+
+def _ensure_user_id_index(conn, table: str) -> None:
+    """Create a userId index once per table so filtered queries avoid a full scan."""
+    try:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_userid ON {table}(userId)")
+    except sqlite3.OperationalError:
+        # Read-only database: fall back to the unindexed scan
+        pass
@@ -1,18 +1,33 @@
-from collections import defaultdict
-from typing import List
+import functools
+from typing import Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from pandas import Timestamp, DataFrame, Timedelta
+from joblib import Parallel, delayed, effective_n_jobs
+from pandas import DataFrame
 
+from util._scanwatch_numba import sleep_status_kernel
 
-def resample_scanwatch_by_overlap(df: DataFrame, min_coverage_s: int, freq: str = "1min") -> DataFrame:
+NS_PER_S = 1_000_000_000
+
+
+@functools.lru_cache(maxsize=32)
+def _freq_ns(freq: str) -> int:
+    """Parse a frequency string to nanoseconds once; repeated calls hit the cache."""
+    return int(pd.to_timedelta(freq).value)
+
+
+def resample_scanwatch_by_overlap(df: DataFrame, min_coverage_s: int, freq: str = "1min",
+                                  n_jobs: int = 1) -> DataFrame:
     """
     Resample scanwatch data using time-weighted aggregation into frequency windows.
 
     Args:
         df: DataFrame with columns 'start_utc', 'durations', 'values'
         freq: Resampling frequency (e.g., '1min', '5min')
+        n_jobs: Number of joblib workers; rows split into contiguous chunks
+            whose sparse window sums are merged afterwards. Default 1 keeps
+            everything in-process.
 
     Returns:
         DataFrame with columns 'window_utc', 'scan_bpm', 'scan_coverage_s'
@@ -20,16 +35,198 @@ def resample_scanwatch_by_overlap(df: DataFrame, min_coverage_s: int, freq: str
     if df.empty:
         return _create_empty_result()
 
-    step = pd.to_timedelta(freq)
-    window_data = defaultdict(lambda: {'weighted_sum': 0.0, 'coverage': 0.0})
+    step_ns = _freq_ns(freq)
+
+    # Rows are independent: segments never span rows, so each contiguous
+    # chunk can aggregate into its own sparse triple and the triples merge
+    # with one more bincount over the union bin range
+    if n_jobs != 1 and len(df) > 1:
+        n_chunks = min(effective_n_jobs(n_jobs), len(df))
+        bounds = np.linspace(0, len(df), n_chunks + 1, dtype=np.int64)
+        triples = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_resample_chunk)(df.iloc[lo:hi], step_ns)
+            for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo
+        )
+    else:
+        triples = [_resample_chunk(df, step_ns)]
+
+    triples = [t for t in triples if t[0].size > 0]
+    if not triples:
+        return _create_empty_result()
 
-    for row in df.itertuples():
-        _process_row(row, step, freq, window_data)
+    bins = np.concatenate([t[0] for t in triples])
+    weighted_parts = np.concatenate([t[1] for t in triples])
+    coverage_parts = np.concatenate([t[2] for t in triples])
+
+    base = int(bins.min())
+    num_bins = int(bins.max()) - base + 1
+    coverage = np.bincount(bins - base, weights=coverage_parts, minlength=num_bins)
+    weighted = np.bincount(bins - base, weights=weighted_parts, minlength=num_bins)
+
+    occupied = np.nonzero(coverage > 0)[0]
+    window_ns = (occupied + base) * step_ns
+
+    return _build_result_dataframe(window_ns, weighted[occupied], coverage[occupied],
+                                   freq, min_coverage_s)
+
+
+def _resample_chunk(df: DataFrame, step_ns: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aggregate one row chunk into sparse (bin, weighted sum, coverage) arrays."""
+    seg_start_ns, seg_end_ns, seg_values = _explode_segments(df)
+
+    if seg_start_ns.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, np.empty(0), np.empty(0)
+
+    first_bin = seg_start_ns // step_ns
+    last_bin = (seg_end_ns - 1) // step_ns
+
+    # Accumulate into a dense array spanning [min_bin, max_bin]: offsetting
+    # by the base bin lets bincount scatter directly without the sort that
+    # np.unique would need to compact the indices first
+    base = int(first_bin.min())
+    num_bins = int(last_bin.max()) - base + 1
+    coverage = np.zeros(num_bins)
+    weighted = np.zeros(num_bins)
+
+    # Fast path for the usual case: a segment shorter than the step that
+    # stays inside one window contributes its full duration to that window,
+    # with no explode needed
+    single = first_bin == last_bin
+    if single.any():
+        duration_s = (seg_end_ns[single] - seg_start_ns[single]) / NS_PER_S
+        dense_idx = first_bin[single] - base
+        coverage += np.bincount(dense_idx, weights=duration_s, minlength=num_bins)
+        weighted += np.bincount(dense_idx, weights=duration_s * seg_values[single],
+                                minlength=num_bins)
+
+    if not single.all():
+        # Explode the boundary-crossing minority to one row per overlapped
+        # window, all in int64 ns
+        multi = ~single
+        multi_first = first_bin[multi]
+        multi_start_ns, multi_end_ns = seg_start_ns[multi], seg_end_ns[multi]
+        bins_per_segment = last_bin[multi] - multi_first + 1
+
+        total = int(bins_per_segment.sum())
+        offsets = np.cumsum(bins_per_segment) - bins_per_segment
+        intra_idx = np.arange(total) - np.repeat(offsets, bins_per_segment)
+        bin_idx = np.repeat(multi_first, bins_per_segment) + intra_idx
+
+        bin_start_ns = bin_idx * step_ns
+        seg_start_rep = np.repeat(multi_start_ns, bins_per_segment)
+        seg_end_rep = np.repeat(multi_end_ns, bins_per_segment)
+        overlap_s = (np.minimum(seg_end_rep, bin_start_ns + step_ns)
+                     - np.maximum(seg_start_rep, bin_start_ns)) / NS_PER_S
+
+        dense_idx = bin_idx - base
+        coverage += np.bincount(dense_idx, weights=overlap_s, minlength=num_bins)
+        weighted += np.bincount(dense_idx,
+                                weights=overlap_s * np.repeat(seg_values[multi], bins_per_segment),
+                                minlength=num_bins)
+
+    # Every segment carries positive overlap somewhere, so coverage > 0
+    # marks exactly the windows that were touched
+    occupied = np.nonzero(coverage > 0)[0]
+    return occupied + base, weighted[occupied], coverage[occupied]
+
+
+def _explode_segments(df: DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten per-row duration/value lists into per-segment ns intervals.
+
+    Rows with mismatched list lengths and segments with non-positive
+    durations are dropped, mirroring the previous per-row validation.
+    Arrow-backed list columns take a buffer-level fast path.
+    """
+    if (isinstance(df['durations'].dtype, pd.ArrowDtype)
+            and isinstance(df['values'].dtype, pd.ArrowDtype)):
+        exploded = _explode_segments_arrow(df)
+        if exploded is not None:
+            return exploded
+
+    durations_col = df['durations'].to_numpy()
+    values_col = df['values'].to_numpy()
+    start_ns = df['start_utc'].to_numpy(dtype='datetime64[ns]').view('int64')
+
+    row_count = len(durations_col)
+    duration_lens = np.fromiter(
+        (len(d) if d is not None else -1 for d in durations_col), dtype=np.int64, count=row_count)
+    value_lens = np.fromiter(
+        (len(v) if v is not None else -2 for v in values_col), dtype=np.int64, count=row_count)
+    valid_rows = duration_lens == value_lens
+
+    nonempty = valid_rows & (duration_lens > 0)
+    if not nonempty.all():
+        durations_col, values_col = durations_col[nonempty], values_col[nonempty]
+        start_ns, duration_lens = start_ns[nonempty], duration_lens[nonempty]
+
+    if duration_lens.sum() == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float64)
+
+    durations_flat = np.concatenate([np.asarray(d) for d in durations_col])
+    if durations_flat.dtype == object:
+        # A None element inside a list (e.g. a JSON null) marks an invalid
+        # segment: zero it so it is dropped instead of breaking the cast
+        durations_flat[np.equal(durations_flat, None)] = 0
+    durations_ns = durations_flat.astype(np.int64) * NS_PER_S
+    values_flat = np.concatenate([np.asarray(v) for v in values_col]).astype(np.float64)
+
+    return _assemble_segments(start_ns, duration_lens, durations_ns, values_flat)
+
+
+def _explode_segments_arrow(df: DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Explode Arrow list columns straight from their flat child buffers.
+
+    Arrow already stores each list column as one contiguous values buffer
+    plus offsets, so the per-row Python traversal and concatenate disappear
+    entirely. Returns None when nulls or mismatched list lengths require
+    the row-validating object path.
+    """
+    import pyarrow.compute as pc
 
-    if not window_data:
-        return _create_empty_result()
+    arrow_durations = df['durations'].array._pa_array.combine_chunks()
+    arrow_values = df['values'].array._pa_array.combine_chunks()
+    if arrow_durations.null_count or arrow_values.null_count:
+        return None
+
+    duration_lens = pc.list_value_length(arrow_durations).to_numpy().astype(np.int64)
+    value_lens = pc.list_value_length(arrow_values).to_numpy().astype(np.int64)
+    if not np.array_equal(duration_lens, value_lens):
+        return None
+
+    start_ns = df['start_utc'].to_numpy(dtype='datetime64[ns]').view('int64')
+    nonempty = duration_lens > 0
+    if not nonempty.all():
+        start_ns, duration_lens = start_ns[nonempty], duration_lens[nonempty]
+
+    if duration_lens.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float64)
+
+    durations_ns = arrow_durations.flatten().to_numpy().astype(np.int64) * NS_PER_S
+    values_flat = arrow_values.flatten().to_numpy().astype(np.float64)
+
+    return _assemble_segments(start_ns, duration_lens, durations_ns, values_flat)
 
-    return _build_result_dataframe(window_data, freq, min_coverage_s)
+
+def _assemble_segments(start_ns: np.ndarray, duration_lens: np.ndarray,
+                       durations_ns: np.ndarray,
+                       values_flat: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Turn flat duration/value buffers into per-segment ns intervals."""
+    # Invalid segments must not advance the row's time cursor, so clamp
+    # negative durations to zero before they enter the cumulative sum
+    durations_ns = np.maximum(durations_ns, 0)
+
+    # Segment starts: row start plus the exclusive cumsum of prior durations
+    cumulative = np.cumsum(durations_ns)
+    exclusive = cumulative - durations_ns
+    row_base = np.repeat(exclusive[np.cumsum(duration_lens) - duration_lens], duration_lens)
+    seg_start_ns = np.repeat(start_ns, duration_lens) + exclusive - row_base
+    seg_end_ns = seg_start_ns + durations_ns
+
+    positive = durations_ns > 0
+    return seg_start_ns[positive], seg_end_ns[positive], values_flat[positive]
 
 
 def annotate_context(min_df: pd.DataFrame, df_sleep: pd.DataFrame, df_sport: pd.DataFrame,
@@ -50,21 +247,30 @@ def annotate_context(min_df: pd.DataFrame, df_sleep: pd.DataFrame, df_sport: pd.
     if min_df.empty:
         return _add_empty_columns(min_df)
 
-    # Calculate time windows
-    step = pd.to_timedelta(freq)
-    window_starts = min_df['window_utc'].to_numpy()
-    window_ends = (min_df['window_utc'] + step).to_numpy()
+    # Calculate time windows, materialized to int64 nanoseconds exactly once
+    window_starts_ns = _to_ns(min_df['window_utc'].to_numpy())
+    window_ends_ns = window_starts_ns + _freq_ns(freq)
 
-    # Annotate sleep status and sport activity
-    sleep_status = _calculate_sleep_status(window_starts, window_ends, df_sleep)
-    is_sport = _calculate_sport_flags(window_starts, window_ends, df_sport)
+    # Pull the interval frames out to numpy here so neither helper repeats
+    # the pandas column materialization
+    sleep_starts_ns, sleep_ends_ns = _intervals_to_ns(df_sleep)
+    sleep_statuses = df_sleep['status'].to_numpy(dtype=np.int64) if not df_sleep.empty \
+        else np.empty(0, dtype=np.int64)
+    sport_starts_ns, sport_ends_ns = _intervals_to_ns(df_sport)
 
-    # Add columns to dataframe
-    min_df = min_df.copy()
-    min_df['sleep_status'] = pd.Series(sleep_status, index=min_df.index, dtype='Int64')
-    min_df['is_sport'] = is_sport
+    # Annotate sleep status and sport activity
+    sleep_status = _calculate_sleep_status(window_starts_ns, window_ends_ns,
+                                           sleep_starts_ns, sleep_ends_ns, sleep_statuses)
+    is_sport = _calculate_sport_flags(window_starts_ns, window_ends_ns,
+                                      sport_starts_ns, sport_ends_ns)
 
-    return min_df
+    # Attach columns via assign: only the two new blocks are allocated,
+    # the existing columns are shared with the caller's frame. Status codes
+    # are tiny integers, so int8 keeps the column 8x smaller than Int64
+    return min_df.assign(
+        sleep_status=sleep_status.astype(np.int8),
+        is_sport=is_sport,
+    )
 
 
 def _create_empty_result() -> DataFrame:
@@ -72,171 +278,92 @@ def _create_empty_result() -> DataFrame:
     return DataFrame(columns=['window_utc', 'scan_bpm', 'scan_coverage_s'])
 
 
-def _process_row(row, step: Timedelta, freq: str, window_data: dict) -> None:
-    """Process a single row of data and update window_data."""
-    durations = row.durations
-    values = row.values
-
-    if not _is_valid_row_data(durations, values):
-        return
-
-    current_time = row.start_utc.to_pydatetime()
-
-    for duration, value in zip(durations, values):
-        if not _is_valid_segment(duration):
-            continue
-
-        segment_start = Timestamp(current_time)
-        segment_end = segment_start + Timedelta(seconds=int(duration))
-        current_time = segment_end.to_pydatetime()
-
-        _process_segment(segment_start, segment_end, value, step, freq, window_data)
-
-
-def _is_valid_row_data(durations: List[int], values: List[float]) -> bool:
-    """Check if row data is valid for processing."""
-    return durations is not None and values is not None and len(durations) == len(values)
-
+def _build_result_dataframe(window_ns: np.ndarray, weighted: np.ndarray,
+                            coverage: np.ndarray, freq: str, min_coverage_s: int) -> DataFrame:
+    """Build the final result DataFrame from accumulated per-window arrays."""
+    avg_value = np.where(coverage > 0, weighted / np.where(coverage > 0, coverage, 1.0), np.nan)
 
-def _is_valid_segment(duration) -> bool:
-    """Check if segment duration is valid."""
-    return duration is not None and duration > 0
-
-
-def _process_segment(
-        segment_start: Timestamp,
-        segment_end: Timestamp,
-        value: float,
-        step: Timedelta,
-        freq: str,
-        window_data: dict
-) -> None:
-    """Process a single segment and update overlapping windows."""
-    window_start = segment_start.floor(freq)
-    last_window = (segment_end - Timedelta(seconds=1)).floor(freq)
-
-    current_window = window_start
-    while current_window <= last_window:
-        window_end = current_window + step
-        overlap_seconds = _calculate_overlap_seconds(segment_start, segment_end, current_window, window_end)
-
-        if overlap_seconds > 0:
-            _update_window_data(current_window, value, overlap_seconds, window_data)
-
-        current_window += step
-
-
-def _calculate_overlap_seconds(
-        seg_start: Timestamp,
-        seg_end: Timestamp,
-        win_start: Timestamp,
-        win_end: Timestamp
-) -> float:
-    """Calculate overlap in seconds between segment and window."""
-    overlap_start = max(seg_start, win_start)
-    overlap_end = min(seg_end, win_end)
-    overlap_timedelta = overlap_end - overlap_start
-    return max(0.0, overlap_timedelta.total_seconds())
-
-
-def _update_window_data(window_start: Timestamp, value: float, overlap_seconds: float, window_data: dict) -> None:
-    """Update window data with weighted value and coverage."""
-    window_data[window_start]['weighted_sum'] += float(value) * overlap_seconds
-    window_data[window_start]['coverage'] += overlap_seconds
-
-
-def _build_result_dataframe(window_data: dict, freq: str, min_coverage_s: int) -> DataFrame:
-    """Build the final result DataFrame from accumulated window data."""
-    rows = []
-    for window_start, data in window_data.items():
-        weighted_sum = data['weighted_sum']
-        coverage = data['coverage']
-
-        avg_value = weighted_sum / coverage if coverage > 0 else np.nan
-        rows.append((Timestamp(window_start), avg_value, coverage))
-
-    result_df = DataFrame(rows, columns=['window_utc', 'scan_bpm', 'scan_coverage_s'])
-    result_df = result_df.sort_values('window_utc').reset_index(drop=True)
+    # Narrow at construction: bpm fits comfortably in float32 and coverage
+    # is whole seconds, halving the column blocks downstream code carries
+    result_df = DataFrame({
+        'window_utc': pd.to_datetime(window_ns, unit='ns', utc=True),
+        'scan_bpm': avg_value.astype(np.float32),
+        'scan_coverage_s': np.rint(coverage).astype(np.int32),
+    })
 
     return _apply_coverage_filter(result_df, freq, min_coverage_s)
 
 
 def _apply_coverage_filter(df: DataFrame, freq: str, min_coverage_s: int) -> DataFrame:
     """Apply coverage filtering to the result DataFrame."""
-    min_coverage = min(min_coverage_s, int(pd.to_timedelta(freq).total_seconds()))
+    min_coverage = min(min_coverage_s, _freq_ns(freq) // NS_PER_S)
     return df[df['scan_coverage_s'] >= min_coverage]
 
 
 def _add_empty_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Add empty sleep_status and is_sport columns to DataFrame."""
-    df = df.copy()
-    df['sleep_status'] = pd.Series(dtype='Int64')
-    df['is_sport'] = pd.Series(dtype=bool)
-    return df
+    return df.assign(
+        sleep_status=pd.Series(dtype=np.int8),
+        is_sport=pd.Series(dtype=bool),
+    )
 
 
-def _calculate_sleep_status(window_starts: np.ndarray, window_ends: np.ndarray,
-                            df_sleep: pd.DataFrame) -> np.ndarray:
+def _calculate_sleep_status(window_starts_ns: np.ndarray, window_ends_ns: np.ndarray,
+                            sleep_starts_ns: np.ndarray, sleep_ends_ns: np.ndarray,
+                            statuses: np.ndarray) -> np.ndarray:
     """Calculate sleep status for each time window based on maximum overlap."""
-    n_windows = len(window_starts)
-    sleep_status = np.zeros(n_windows, dtype='int64')
-
-    if df_sleep.empty:
-        return sleep_status
-
-    sleep_starts = df_sleep['start_utc'].to_numpy()
-    sleep_ends = df_sleep['end_utc'].to_numpy()
-    sleep_statuses = df_sleep['status'].to_numpy()
-
-    for i in range(n_windows):
-        best_status = 0
-        max_overlap = pd.Timedelta(0)
-
-        for sleep_start, sleep_end, status in zip(sleep_starts, sleep_ends, sleep_statuses):
-            overlap = _calculate_time_overlap(window_starts[i], window_ends[i], sleep_start, sleep_end)
-
-            if overlap > max_overlap:
-                max_overlap = overlap
-                best_status = int(status)
-
-        sleep_status[i] = best_status
-
-    return sleep_status
+    if sleep_starts_ns.size == 0:
+        return np.zeros(len(window_starts_ns), dtype='int64')
+
+    # Sort by start and carry the running maximum of ends so the kernel can
+    # binary-search each window's candidate range instead of scanning all
+    # intervals
+    order = np.argsort(sleep_starts_ns, kind='stable')
+    sleep_starts_sorted = sleep_starts_ns[order]
+    sleep_ends_sorted = sleep_ends_ns[order]
+    max_end_prefix = np.maximum.accumulate(sleep_ends_sorted)
+
+    return sleep_status_kernel(
+        window_starts_ns,
+        window_ends_ns,
+        sleep_starts_sorted,
+        sleep_ends_sorted,
+        statuses[order],
+        max_end_prefix,
+    )
+
+
+def _to_ns(timestamps: np.ndarray) -> np.ndarray:
+    """Convert an array of (possibly tz-aware) timestamps to int64 nanoseconds."""
+    return pd.DatetimeIndex(timestamps).asi8
+
+
+def _intervals_to_ns(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Materialize an interval frame's start/end columns as int64 nanoseconds."""
+    if df.empty:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return _to_ns(df['start_utc'].to_numpy()), _to_ns(df['end_utc'].to_numpy())
 
 
-def _calculate_sport_flags(window_starts: np.ndarray, window_ends: np.ndarray,
-                           df_sport: pd.DataFrame) -> np.ndarray:
+def _calculate_sport_flags(window_starts_ns: np.ndarray, window_ends_ns: np.ndarray,
+                           sport_starts_ns: np.ndarray, sport_ends_ns: np.ndarray) -> np.ndarray:
     """Calculate sport activity flags for each time window."""
-    n_windows = len(window_starts)
+    n_windows = len(window_starts_ns)
     is_sport = np.zeros(n_windows, dtype=bool)
 
-    if df_sport.empty:
+    if sport_starts_ns.size == 0:
         return is_sport
 
-    sport_starts = df_sport['start_utc'].to_numpy()
-    sport_ends = df_sport['end_utc'].to_numpy()
+    # A window overlaps some sport iff, among sports starting before the
+    # window's end, the maximum sport end exceeds the window's start —
+    # one sort plus a prefix-max turns the nested loop into two searches
+    order = np.argsort(sport_starts_ns, kind='stable')
+    sport_starts_sorted = sport_starts_ns[order]
+    max_end_prefix = np.maximum.accumulate(sport_ends_ns[order])
 
-    for i in range(n_windows):
-        for sport_start, sport_end in zip(sport_starts, sport_ends):
-            if _has_overlap(window_starts[i], window_ends[i], sport_start, sport_end):
-                is_sport[i] = True
-                break
+    idx = np.searchsorted(sport_starts_sorted, window_ends_ns, side='left') - 1
+    candidates = idx >= 0
+    is_sport[candidates] = max_end_prefix[idx[candidates]] > window_starts_ns[candidates]
 
     return is_sport
-
-
-def _calculate_time_overlap(start1: np.datetime64, end1: np.datetime64,
-                            start2: np.datetime64, end2: np.datetime64) -> pd.Timedelta:
-    """Calculate overlap duration between two time intervals."""
-    if start2 >= end1 or end2 <= start1:
-        return pd.Timedelta(0)
-
-    overlap_start = max(start1, start2)
-    overlap_end = min(end1, end2)
-    return overlap_end - overlap_start
-
-
-def _has_overlap(start1: np.datetime64, end1: np.datetime64,
-                 start2: np.datetime64, end2: np.datetime64) -> bool:
-    """Check if two time intervals overlap."""
-    return start2 < end1 and end2 > start1
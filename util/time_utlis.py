@@ -1,12 +1,19 @@
-import pandas as pd
+import functools
 from datetime import timezone
+from typing import Optional
+
+import pandas as pd
 from dateutil import parser as dtparser
 from pandas import Timestamp, Series
 
 
+@functools.lru_cache(maxsize=1024)
 def parse_iso_to_utc(ts: str) -> Timestamp:
     """Parse an ISO 8601 formatted datetime string to a UTC timezone-aware Timestamp.
 
+    Results are memoized: pipelines often re-parse the same handful of
+    boundary timestamps, and a cache hit skips dateutil entirely.
+
     Args:
         ts: An ISO 8601 formatted datetime string with timezone information.
 
@@ -22,12 +29,17 @@ def parse_iso_to_utc(ts: str) -> Timestamp:
     return pd.Timestamp(dt.astimezone(timezone.utc))
 
 
-def to_utc_from_local_string(s: Series, start_timezone: str) -> Series:
+def to_utc_from_local_string(s: Series, start_timezone: str, *,
+                             format: Optional[str] = None, cache: bool = True) -> Series:
     """Convert a Series of timezone-naive datetime strings to UTC timestamps.
 
     Args:
         s: A pandas Series containing datetime strings without timezone information.
         start_timezone: The timezone to localize the naive datetimes before conversion to UTC.
+        format: Optional strftime format passed to pd.to_datetime; when the
+            layout is known this selects the specialized parser instead of
+            per-element format inference.
+        cache: Passed to pd.to_datetime; reuses conversions for repeated strings.
 
     Returns:
         A pandas Series of UTC timezone-aware Timestamps.
@@ -36,7 +48,7 @@ def to_utc_from_local_string(s: Series, start_timezone: str) -> Series:
         TypeError: If the input Series contains non-string values.
         ValueError: If the timezone string is invalid or the datetime strings are malformed.
     """
-    ts = pd.to_datetime(s)
+    ts = pd.to_datetime(s, format=format, cache=cache)
     return ts.dt.tz_localize(start_timezone).dt.tz_convert('UTC')
 
 